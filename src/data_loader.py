@@ -2,15 +2,20 @@
 Module for downloading and loading sanctions lists from external sources
 '''
 
-import requests
+import asyncio
+import gzip
+
+import aiohttp
 import pandas as pd
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 from pathlib import Path
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+EU_NAMESPACE = {'eu': 'http://eu.europa.ec/fpi/fsd/export'}
+
 class SanctionsLoader:
     '''
     Downloads and parses sanctions list from configured sources
@@ -25,55 +30,21 @@ class SanctionsLoader:
         self.config = config
         self.data_dir = Path('data/sanctions_lists')
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        
-    def download_un_list(self, url):
-        '''
-        Download UN sanctions list XML from given URL
-        Args:
-            url (str): URL to UN XML sanctions list
-        Returns:
-            str: path to downloaded file
-        '''
-        logger.info(f"Downloading UN sanctions list from {url}")
-        
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            file_path = self.data_dir / 'un_consolidated.xml'
-            file_path.write_bytes(response.content)
-            
-            logger.info(f'Downloaded UN sanctions list to {file_path}')
-            return str(file_path)
-        
-        except requests.exceptions.RequestException as e:
-            logger.error(f'Failed to download UN sanctions list: {e}')
-            raise
-        
-    def download_eu_list(self, url):
+
+    def _open_xml(self, xml_path):
         '''
-        Download Consolidated EU sanctions list XML from given URL
+        Docstring for _open_xml
+        Open a downloaded list for parsing. iterparse does not transparently
+        decompress gzip (only etree.parse does), so unpack the cache file here.
         Args:
-            url (str): URL to EU XML sanctions list
+            xml_path (str): Path to a plain or gzipped XML file
         Returns:
-            str: path to downloaded file
+            file object: Binary handle ready for ET.iterparse
         '''
-        logger.info(f"Downloading EU sanctions list from {url}")
-        
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            file_path = self.data_dir / 'eu_consolidated.xml'
-            file_path.write_bytes(response.content)
-            
-            logger.info(f'Downloaded EU sanctions list to {file_path}')
-            return str(file_path)
-        
-        except requests.exceptions.RequestException as e:
-            logger.error(f'Failed to download EU sanctions list: {e}')
-            raise        
-        
+        if str(xml_path).endswith('.gz'):
+            return gzip.open(xml_path, 'rb')
+        return open(xml_path, 'rb')
+
     def parse_un_xml(self, xml_path):
         '''
         Docstring for parse_un_xml
@@ -84,52 +55,75 @@ class SanctionsLoader:
             pd.DataFrame: DataFrame containing parsed sanctions data
         '''
         logger.info(f'Parsing UN sanctions list from {xml_path}')
-        
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        
-        entities = []
-        # UN XML structure has INDIVIDUAL and ENTITY elements
-        for entity in root.findall('.//INDIVIDUAL') + root.findall('.//ENTITY'):
+
+        # One list per column, so pandas skips per-row dict inference
+        col_names = []
+        col_references = []
+        col_list_types = []
+        col_types = []
+        xml_file = self._open_xml(xml_path)
+        # UN XML structure has INDIVIDUAL and ENTITY elements; stream them one
+        # at a time instead of loading the whole tree into memory
+        for event, entity in ET.iterparse(xml_file, events=('end',)):
+            if entity.tag not in ('INDIVIDUAL', 'ENTITY'):
+                continue
+
+            # One linear scan over the direct children instead of repeated
+            # .// subtree walks per field
+            fields = {}
+            alias_names = []
+            for child in entity:
+                if child.tag in ('INDIVIDUAL_ALIAS', 'ENTITY_ALIAS'):
+                    alias_name = child.findtext('ALIAS_NAME', '')
+                    if alias_name:
+                        alias_names.append(alias_name)
+                else:
+                    fields[child.tag] = child.text or ''
+
             # Extract name variations
             names = []
-            
+
             if entity.tag == 'INDIVIDUAL':
                 kind = 'INDIVIDUAL'
                 # Primary name
-                first_name = entity.findtext('.//FIRST_NAME', '')
-                second_name = entity.findtext('.//SECOND_NAME', '')
-                third_name = entity.findtext('.//THIRD_NAME', '')
-                fourth_name = entity.findtext('.//FOURTH_NAME', '')
-    
-                full_name = ' '.join([first_name, second_name, third_name, fourth_name]).strip()
+                full_name = ' '.join(
+                    fields.get(tag, '')
+                    for tag in ('FIRST_NAME', 'SECOND_NAME', 'THIRD_NAME', 'FOURTH_NAME')
+                ).strip()
                 if full_name:
                     names.append(full_name)
-                
+
             else: # ENTITY
                 kind = 'ENTITY'
                 # Company name
-                entity_name = entity.findtext('.//FIRST_NAME','').strip() # For entities, name is in FIRST_NAME
+                entity_name = fields.get('FIRST_NAME', '').strip() # For entities, name is in FIRST_NAME
                 if entity_name:
                     names.append(entity_name)
-                
+
             # Aliases
-            for alias in entity.findall('.//INDIVIDUAL_ALIAS') + entity.findall('.//ENTITY_ALIAS'):
-                alias_name = alias.findtext('.//ALIAS_NAME', '')
-                if alias_name:
-                    names.append(alias_name)
-                    
+            names.extend(alias_names)
+
             # Add all variations as separate records
+            reference_number = fields.get('REFERENCE_NUMBER', '')
+            list_type = fields.get('UN_LIST_TYPE', '')
             for name in names:
-                entities.append({
-                    'name': name,
-                    'reference_number': entity.findtext('.//REFERENCE_NUMBER', ''),
-                    'list_type': entity.findtext('.//UN_LIST_TYPE', ''),
-                    'source': 'UN',
-                    'type': kind
-                    })
-                
-        df = pd.DataFrame(entities)
+                col_names.append(name)
+                col_references.append(reference_number)
+                col_list_types.append(list_type)
+                col_types.append(kind)
+
+            # Free the consumed element so peak memory stays O(one entity)
+            entity.clear()
+
+        xml_file.close()
+
+        df = pd.DataFrame({
+            'name': pd.array(col_names, dtype='string[pyarrow]'),
+            'reference_number': pd.array(col_references, dtype='string[pyarrow]'),
+            'list_type': pd.Categorical(col_list_types),
+            'source': pd.Categorical(['UN'] * len(col_names)),
+            'type': pd.Categorical(col_types)
+        })
         logger.info(f'Parsed {len(df)} entities from UN list')
         
         return df
@@ -144,37 +138,124 @@ class SanctionsLoader:
             pd.DataFrame: DataFrame containing parsed sanctions data
         '''
         logger.info(f'Parsing EU sanctions list from {xml_path}')
-        
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        
 
-        name_space = {'eu' : 'http://eu.europa.ec/fpi/fsd/export'}
-        
-        entities = []
-        # EU XML structure has sanctionEntity elements
-        for entity in root.findall('eu:sanctionEntity', name_space):
-            # Get sanctionEntity type
-            subject_type = entity.findtext('eu:subjectType/eu:code', default='', namespaces=name_space).lower()
-            
-            # Get all aliases
-            for name_alias in entity.findall('eu:nameAlias', name_space):
-                whole_name = name_alias.get('wholeName', '').strip()
-
-                if whole_name:
-                    entities.append({
-                        'name': whole_name,
-                        'reference_number': entity.get('euReferenceNumber',''),
-                        'list_type': "EU Consolidated List",
-                        'source': "EU",
-                        'type': "ENTITY" if subject_type == 'enterprise' else 'INDIVIDUAL'
-                    })
-            
-        df = pd.DataFrame(entities)
+        entity_tag = '{%s}sanctionEntity' % EU_NAMESPACE['eu']
+        subject_type_tag = '{%s}subjectType' % EU_NAMESPACE['eu']
+        code_tag = '{%s}code' % EU_NAMESPACE['eu']
+        name_alias_tag = '{%s}nameAlias' % EU_NAMESPACE['eu']
+
+        # One list per column, so pandas skips per-row dict inference
+        col_names = []
+        col_references = []
+        col_types = []
+        xml_file = self._open_xml(xml_path)
+        # EU XML structure has sanctionEntity elements; stream them one at a
+        # time instead of loading the whole tree into memory
+        for event, entity in ET.iterparse(xml_file, events=('end',)):
+            if entity.tag != entity_tag:
+                continue
+
+            # One linear scan over the direct children instead of repeated
+            # XPath walks per field
+            subject_type = ''
+            whole_names = []
+            for child in entity:
+                if child.tag == name_alias_tag:
+                    whole_name = child.get('wholeName', '').strip()
+                    if whole_name:
+                        whole_names.append(whole_name)
+                elif child.tag == subject_type_tag:
+                    subject_type = (child.findtext(code_tag) or '').lower()
+
+            reference_number = entity.get('euReferenceNumber', '')
+            kind = 'ENTITY' if subject_type == 'enterprise' else 'INDIVIDUAL'
+            for whole_name in whole_names:
+                col_names.append(whole_name)
+                col_references.append(reference_number)
+                col_types.append(kind)
+
+            # Free the consumed element so peak memory stays O(one entity)
+            entity.clear()
+
+        xml_file.close()
+
+        df = pd.DataFrame({
+            'name': pd.array(col_names, dtype='string[pyarrow]'),
+            'reference_number': pd.array(col_references, dtype='string[pyarrow]'),
+            'list_type': pd.Categorical(['EU Consolidated List'] * len(col_names)),
+            'source': pd.Categorical(['EU'] * len(col_names)),
+            'type': pd.Categorical(col_types)
+        })
         logger.info(f'Parsed {len(df)} entities from EU Consolidated list')
         
         return df
     
+    async def _download(self, session, url, filename):
+        '''
+        Docstring for _download
+        Download one sanctions list with a shared aiohttp session
+        Args:
+            session (aiohttp.ClientSession): shared HTTP session
+            url (str): URL to download
+            filename (str): target filename inside the data directory
+        Returns:
+            str: path to downloaded file
+        '''
+        logger.info(f'Downloading {filename} from {url}')
+
+        # Cached gzipped copy plus the ETag it was downloaded with; lxml reads
+        # gzip-compressed XML natively
+        file_path = self.data_dir / f'{filename}.gz'
+        etag_path = self.data_dir / f'{filename}.etag'
+
+        headers = {}
+        if file_path.exists() and etag_path.exists():
+            headers['If-None-Match'] = etag_path.read_text().strip()
+
+        try:
+            # Stream the body straight to disk instead of buffering it in RAM
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30),
+                                   headers=headers) as response:
+                if response.status == 304:
+                    logger.info(f'{filename} unchanged upstream, reusing {file_path}')
+                    return str(file_path)
+
+                response.raise_for_status()
+                with gzip.open(file_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(65536):
+                        f.write(chunk)
+
+                etag = response.headers.get('ETag')
+                if etag:
+                    etag_path.write_text(etag)
+                elif etag_path.exists():
+                    etag_path.unlink()
+
+            logger.info(f'Downloaded sanctions list to {file_path}')
+            return str(file_path)
+
+        except aiohttp.ClientError as e:
+            logger.error(f'Failed to download {url}: {e}')
+            raise
+
+    async def _download_all(self, downloads):
+        '''
+        Docstring for _download_all
+        Download all configured lists concurrently
+        Args:
+            downloads (list): (source_name, url, filename) tuples
+        Returns:
+            dict: source_name -> downloaded file path
+        '''
+        async with aiohttp.ClientSession() as session:
+            async with asyncio.TaskGroup() as tg:
+                tasks = {
+                    source_name: tg.create_task(self._download(session, url, filename))
+                    for source_name, url, filename in downloads
+                }
+
+        return {source_name: task.result() for source_name, task in tasks.items()}
+
     def load_all_lists(self):
         '''
         Docstring for load_all_lists
@@ -182,30 +263,38 @@ class SanctionsLoader:
         Returns:
             pd.DataFrame: combined lists
         '''
-        all_sanctions = []
-        
         sources = self.config.get('sanctions_sources',{})
 
-        for source_name, source_config in sources.items():
-            if not source_config.get('enabled', True):
-                continue
+        # Dispatch every enabled download at once; wall time is the slowest
+        # source instead of the sum of all of them
+        downloads = [
+            (source_name, source_config['url'], f'{source_name}.xml')
+            for source_name, source_config in sources.items()
+            if source_config.get('enabled', True)
+        ]
+        xml_paths = asyncio.run(self._download_all(downloads))
+
+        all_sanctions = []
+        for source_name, xml_path in xml_paths.items():
             logger.info(f'Processing source: {source_name}')
-        
+
             if source_name == 'un_consolidated':
-                xml_path = self.download_un_list(source_config['url'])
-                df = self.parse_un_xml(xml_path)
-                all_sanctions.append(df)
-                
+                all_sanctions.append(self.parse_un_xml(xml_path))
+
             if source_name == 'eu_consolidated':
-                xml_path = self.download_eu_list(source_config['url'])
-                df = self.parse_eu_xml(xml_path)
-                all_sanctions.append(df)
-                
+                all_sanctions.append(self.parse_eu_xml(xml_path))
+
         if not all_sanctions:
             logger.warning('No sanctions lists loaded')
             return pd.DataFrame()
         
         combined = pd.concat(all_sanctions, ignore_index=True)
+
+        # concat falls back to object when the per-source category sets differ,
+        # so re-cast the low-cardinality columns on the combined frame
+        for column in ('type', 'source', 'list_type'):
+            combined[column] = combined[column].astype('category')
+
         logger.info(f'Total sanctions entities loaded: {len(combined)}')           
         
         return combined
\ No newline at end of file
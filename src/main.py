@@ -6,6 +6,8 @@ Main script for sanctions screening
 import yaml
 import logging
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pathlib import Path
 from datetime import datetime
 
@@ -70,7 +72,8 @@ def main():
     
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     results_file = output_dir / f'screening_results_{timestamp}.csv'
-    results_df.to_csv(results_file, index=False)
+    # Arrow's C++ CSV writer is several times faster than to_csv here
+    pacsv.write_csv(pa.Table.from_pandas(results_df, preserve_index=False), str(results_file))
     
     logger.info(f'Reults saved to {results_file}')
     
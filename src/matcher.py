@@ -3,12 +3,85 @@ Docstring for src.matcher
 Fuzzy matching logic for comparing company names against sanctions list
 '''
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz
+import pyarrow as pa
+from rapidfuzz import fuzz, process
 import logging
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
+# Common legal suffixes, compiled once (longer forms first so e.g. INCORPORATED
+# is not eaten by INC). Kept lookahead-free so the same pattern runs on
+# Arrow's re2 engine in the vectorized path
+_SUFFIX_RE = re.compile(
+    r'[ .](?:LIMITED|LTD|INCORPORATED|INC|CORPORATION|CORP|LLC|GMBH|SA|SPA|AG|NV|BV'
+    r'|SP Z OO)\b|[ .]SP\. Z O\.O\.'
+)
+
+# Punctuation stripped from names
+_PUNCT_RE = re.compile(r'[.,\-]')
+
+# Runs of whitespace collapsed to single spaces
+_SPACE_RE = re.compile(r'\s+')
+
+# Punctuation table for the scalar path; str.translate is a C-level lookup
+_PUNCT_TBL = str.maketrans('', '', '.,-')
+
+if HAS_NUMBA:
+    @njit(cache=True, parallel=True)
+    def _ascii_clean(data, offsets, scratch, lengths):
+        '''
+        Uppercase ASCII, drop .,- and collapse whitespace runs, operating
+        directly on the UTF-8 bytes of an Arrow string array. Each string is
+        compacted in place into its own scratch slot; lengths records how many
+        bytes survived. Bytes >= 0x80 (multi-byte UTF-8) pass through untouched.
+        '''
+        for i in prange(len(lengths)):
+            start = offsets[i]
+            end = offsets[i + 1]
+            write = start
+            prev_space = True
+            for pos in range(start, end):
+                b = data[pos]
+                if 97 <= b <= 122:  # a-z -> A-Z
+                    b -= 32
+                if b == 46 or b == 44 or b == 45:  # . , -
+                    continue
+                if b == 32 or b == 9 or b == 10 or b == 13:
+                    if prev_space:
+                        continue
+                    b = 32
+                    prev_space = True
+                else:
+                    prev_space = False
+                scratch[write] = b
+                write += 1
+            if write > start and scratch[write - 1] == 32:
+                write -= 1
+            lengths[i] = write - start
+
+    @njit(cache=True)
+    def _compact(scratch, offsets, lengths, out, out_offsets):
+        '''
+        Pack the per-string scratch slots into one contiguous output buffer.
+        '''
+        for i in range(len(lengths)):
+            src = offsets[i]
+            dst = out_offsets[i]
+            for k in range(lengths[i]):
+                out[dst + k] = scratch[src + k]
+
 class SanctionsMatcher:
     '''
     Docstring for SanctionsMatcher
@@ -23,7 +96,7 @@ class SanctionsMatcher:
         '''
         self.threshold = config['matching']['threshold']
         self.algorithm = config['matching']['algorithm']
-        logger.info(f'Matcher initialized with threshold={self.threshold} and algorithm={self.algorithm}')
+        logger.info('Matcher initialized with threshold=%s and algorithm=%s', self.threshold, self.algorithm)
         
     def normalize_name(self, name):
         '''
@@ -36,28 +109,156 @@ class SanctionsMatcher:
         '''
         if pd.isna(name):
             return ""
-        
+
         # Convert to uppercase
         name = str(name).upper()
-        
-        # Remove common legal suffixes
-        suffixes = [
-            'LTD', 'LIMITED', 'INC', 'INCORPORATED', 'CORP', 'CORPORATION',
-            'LLC', 'GMBH', 'SA', 'SPA', 'AG', 'NV', 'BV', 'SP Z OO', 'SP. Z O.O.'
-        ]
-        
-        for suffix in suffixes:
-            name = name.replace(f' {suffix}', '')
-            name = name.replace(f'.{suffix}', '')
-            
-        # Remove dots
-        name = name.replace('.', '').replace(',', '').replace('-', '')
-        
+
+        # Remove common legal suffixes in one regex pass
+        name = _SUFFIX_RE.sub('', name)
+
+        # Remove punctuation via translation table
+        name = name.translate(_PUNCT_TBL)
+
         # Remove extra spaces
         name = ' '.join(name.split())
-        
+
         return name
     
+    def normalize_names(self, names):
+        '''
+        Docstring for normalize_names
+        Normalize a whole Series of names with vectorized Arrow string kernels.
+        Args:
+            names (pd.Series): Raw names
+        Returns:
+            np.ndarray: Normalized names
+        '''
+        normalized = (
+            names.astype('string[pyarrow]').fillna('')
+            .str.upper()
+            .str.replace(_SUFFIX_RE.pattern, '', regex=True)
+        )
+
+        if HAS_NUMBA:
+            cleaned = self._ascii_clean_bulk(normalized)
+            if cleaned is not None:
+                return cleaned
+
+        normalized = (
+            normalized
+            .str.replace(_PUNCT_RE.pattern, '', regex=True)
+            .str.replace(_SPACE_RE.pattern, ' ', regex=True)
+            .str.strip()
+        )
+        return normalized.to_numpy(dtype=object)
+
+    def _ascii_clean_bulk(self, normalized):
+        '''
+        Docstring for _ascii_clean_bulk
+        Run the numba byte kernel (punctuation strip + space collapse) over the
+        Arrow buffers of a string Series in one pass.
+        Args:
+            normalized (pd.Series): Uppercased, suffix-stripped names
+        Returns:
+            np.ndarray or None: Cleaned names, None if the layout is unsuitable
+        '''
+        arr = pa.array(normalized)
+        if isinstance(arr, pa.ChunkedArray):
+            arr = arr.combine_chunks()
+
+        n = len(arr)
+        if n == 0:
+            return np.empty(0, dtype=object)
+
+        # pandas >= 2.1 backs string[pyarrow] with large_string (64-bit
+        # offsets), so accept both offset widths
+        if pa.types.is_string(arr.type):
+            offset_dtype = np.int32
+        elif pa.types.is_large_string(arr.type):
+            offset_dtype = np.int64
+        else:
+            return None
+        if arr.offset != 0 or arr.null_count:
+            return None
+
+        buffers = arr.buffers()
+        offsets = np.frombuffer(buffers[1], dtype=offset_dtype)[:n + 1].astype(np.int64)
+        data = np.frombuffer(buffers[2], dtype=np.uint8)
+
+        scratch = np.empty(int(offsets[n]), dtype=np.uint8)
+        lengths = np.zeros(n, dtype=np.int64)
+        _ascii_clean(data, offsets, scratch, lengths)
+
+        out_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=out_offsets[1:])
+        out = np.empty(int(out_offsets[n]), dtype=np.uint8)
+        _compact(scratch, offsets, lengths, out, out_offsets)
+
+        if offset_dtype is np.int32:
+            result = pa.StringArray.from_buffers(
+                n, pa.py_buffer(out_offsets.astype(np.int32)), pa.py_buffer(out))
+        else:
+            result = pa.LargeStringArray.from_buffers(
+                n, pa.py_buffer(out_offsets), pa.py_buffer(out))
+        return result.to_numpy(zero_copy_only=False)
+
+    def token_sort_key(self, name, unique=False):
+        '''
+        Docstring for token_sort_key
+        Sort (optionally dedupe) the tokens of a normalized name.
+        Args:
+            name (str): Normalized name
+            unique (bool): Drop duplicate tokens (for token_set_ratio)
+        Returns:
+            str: Token-sorted key
+        '''
+        tokens = set(name.split()) if unique else name.split()
+        return ' '.join(sorted(tokens))
+
+    def build_token_index(self, names):
+        '''
+        Docstring for build_token_index
+        Build an inverted index from name tokens to the row indices containing them.
+        Tokens shorter than 3 characters are too unselective to block on.
+        Args:
+            names (np.ndarray): Normalized names
+        Returns:
+            dict: token -> np.ndarray of row indices
+        '''
+        token_index = {}
+        for row, name in enumerate(names):
+            for token in set(name.split()):
+                if len(token) >= 3:
+                    token_index.setdefault(token, []).append(row)
+
+        return {token: np.asarray(rows) for token, rows in token_index.items()}
+
+    def candidate_indices(self, name, token_index, total):
+        '''
+        Docstring for candidate_indices
+        Union the index posting lists for a name's tokens.
+        Args:
+            name (str): Normalized company name
+            token_index (dict): Index from build_token_index
+            total (int): Number of indexed sanctions rows
+        Returns:
+            np.ndarray or None: Candidate row indices. Every row if the name
+            has no indexable token (blocking cannot be applied there, which is
+            not evidence the company is clean), None if its tokens are
+            indexable but shared with no sanction.
+        '''
+        tokens = [token for token in set(name.split()) if len(token) >= 3]
+
+        if not tokens:
+            return np.arange(total)
+
+        postings = [token_index[token] for token in tokens if token in token_index]
+
+        if not postings:
+            return None
+
+        return np.unique(np.concatenate(postings))
+
     def calculate_similarity(self, name1, name2):
         '''
         Docstring for calculate_similarity
@@ -76,50 +277,6 @@ class SanctionsMatcher:
         else:
             return fuzz.ratio(name1, name2)
         
-    def match_single_company(self, company_name, sanctions_df):
-        '''
-        Docstring for match_single_company
-        Match a single company against sanctions list
-        
-        Args:
-            company_name (str): Company name to check
-            sanctions_df (pd.DataFrame): Sanctions list
-            
-        Returns:
-            list: List of matches with scores
-        '''
-        
-        normalized_company = self.normalize_name(company_name)
-        
-        if not normalized_company:
-            return []
-        
-        matches = []
-        # Compare against all sanctioned entities
-        for idx, row in sanctions_df.iterrows():
-            sanctions_name = self.normalize_name(row['name'])
-            
-            if not sanctions_name:
-                continue
-            
-            score = self.calculate_similarity(normalized_company, sanctions_name)
-            
-            if score >= self.threshold:
-                matches.append({
-                    'sanctions_name': row['name'],
-                    'normalized_sanctions_name': sanctions_name,
-                    'type': row.get('type', 'UNKNOWN'),
-                    'reference_number': row['reference_number'],
-                    'list_type': row['list_type'],
-                    'source': row['source'],
-                    'score': score
-                })
-                
-        # Sort by score descending
-        matches.sort(key=lambda x: x['score'], reverse=True)
-        
-        return matches
-    
     def match_companies(self, companies_df, sanctions_df):
         '''
         Docstring for match_companies
@@ -127,60 +284,129 @@ class SanctionsMatcher:
         Args:
             companies_df (pd.DataFrame): Companies to check
             sanctions_df (pd.DataFrame): Sanctions list
-            
+
         Returns:
             pd.DataFrame: Results with matches
         '''
-        entity_sanctions = sanctions_df[sanctions_df['type'] == 'ENTITY'].copy()
-        
+        entity_sanctions = sanctions_df[sanctions_df['type'] == 'ENTITY'].reset_index(drop=True)
+
         if entity_sanctions.empty:
-            logger.warning('No ENTITY records available for matching')  
-        
-        logger.info(f'Matching {len(companies_df)} companies against {len(entity_sanctions)} sanctioned entities')
+            logger.warning('No ENTITY records available for matching')
+
+        logger.info('Matching %d companies against %d sanctioned entities', len(companies_df), len(entity_sanctions))
+
+        # Normalize both sides exactly once up-front
+        comp_names = self.normalize_names(companies_df['company_name'])
+        sanc_names = self.normalize_names(entity_sanctions['name'])
+
+        scorer = getattr(fuzz, self.algorithm, fuzz.ratio)
+
+        if self.algorithm == 'token_sort_ratio':
+            # With both sides pre-sorted, token_sort_ratio reduces to the
+            # cheaper plain ratio: no per-call split/sort/join
+            comp_names = np.array([self.token_sort_key(n) for n in comp_names], dtype=object)
+            sanc_names = np.array([self.token_sort_key(n) for n in sanc_names], dtype=object)
+            scorer = fuzz.ratio
+        elif self.algorithm == 'token_set_ratio':
+            # Deduped, sorted keys shrink the strings token_set_ratio sees
+            comp_names = np.array([self.token_sort_key(n, unique=True) for n in comp_names], dtype=object)
+            sanc_names = np.array([self.token_sort_key(n, unique=True) for n in sanc_names], dtype=object)
+
+        # Blocking: only score sanctions that share at least one token with the
+        # company, instead of the full N*M cross product
+        token_index = self.build_token_index(sanc_names)
+
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        def score_company(item):
+            i, name = item
+
+            if debug_enabled:
+                logger.debug('Checking company: %s', name)
+
+            if not name:
+                return []
+
+            candidates = self.candidate_indices(name, token_index, len(sanc_names))
+
+            if candidates is None:
+                return []
+
+            cand_scores = process.cdist(
+                [name], sanc_names[candidates],
+                scorer=scorer,
+                score_cutoff=self.threshold,
+                dtype=np.uint8
+            )[0]
+
+            above = cand_scores >= self.threshold
+            return [(i, j, score) for j, score in zip(candidates[above], cand_scores[above])]
+
+        # The rapidfuzz scorers release the GIL, so threads scale with cores
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            per_company = executor.map(score_company, enumerate(comp_names))
+            hit_rows = [hit for company_hits in per_company for hit in company_hits]
+
+        hits = np.array(hit_rows, dtype=int).reshape(-1, 3)
+
+        company_ids = (companies_df['company_id'] if 'company_id' in companies_df.columns
+                       else companies_df.index.to_series()).to_numpy()
+        company_names = companies_df.get('company_name', pd.Series([''] * len(companies_df))).to_numpy()
+        countries = companies_df.get('country', pd.Series([''] * len(companies_df))).to_numpy()
+
+        matched_mask = np.zeros(len(companies_df), dtype=bool)
+
+        if len(hits):
+            comp_idx = hits[:, 0]
+            sanc_idx = hits[:, 1]
+            hit_scores = hits[:, 2].astype(float)
+
+            # Per company, matches sorted by score descending
+            order = np.lexsort((-hit_scores, comp_idx))
+            comp_idx = comp_idx[order]
+            sanc_idx = sanc_idx[order]
+            hit_scores = hit_scores[order]
+
+            matched_mask[comp_idx] = True
+
+            # Gather sanction columns as ndarrays; no per-row Series/DataFrame
+            matched_df = pd.DataFrame({
+                'company_id': company_ids[comp_idx],
+                'company_name': company_names[comp_idx],
+                'country': countries[comp_idx],
+                'match_found': True,
+                'sanctions_name': entity_sanctions['name'].to_numpy()[sanc_idx],
+                'reference_number': entity_sanctions['reference_number'].to_numpy()[sanc_idx],
+                'list_type': entity_sanctions['list_type'].to_numpy()[sanc_idx],
+                'source': entity_sanctions['source'].to_numpy()[sanc_idx],
+                'match_score': hit_scores
+            })
+
+            logger.warning('POTENTIAL MATCHES FOUND for %d companies (%d match records)', matched_mask.sum(), len(matched_df))
+        else:
+            comp_idx = np.empty(0, dtype=int)
+            matched_df = pd.DataFrame()
+
+        # Companies with no match above threshold
+        unmatched_idx = np.flatnonzero(~matched_mask)
+        unmatched_df = pd.DataFrame({
+            'company_id': company_ids[unmatched_idx],
+            'company_name': company_names[unmatched_idx],
+            'country': countries[unmatched_idx],
+            'match_found': False,
+            'sanctions_name': None,
+            'reference_number': None,
+            'list_type': None,
+            'source': None,
+            'match_score': None
+        })
+
+        # Restore original company order (stable, so per-company score order survives)
+        all_pos = np.concatenate([comp_idx, unmatched_idx])
+        results_df = pd.concat([matched_df, unmatched_df], ignore_index=True)
+        results_df = results_df.iloc[np.argsort(all_pos, kind='stable')].reset_index(drop=True)
 
-        results = []
-        
-        for idx, company in companies_df.iterrows():
-            company_id = company.get('company_id', idx)
-            company_name = company.get('company_name', '')
-            country = company.get('country', '')
-            
-            logger.debug(f'Checking company: {company_name}')
-            
-            matches = self.match_single_company(company_name, entity_sanctions)
-            
-            if matches:
-                logger.warning(f'POTENTIAL MATCH FOUND for {company_name}: {len(matches)} matches')
-                
-                for match in matches:
-                    results.append({
-                        'company_id': company_id,
-                        'company_name': company_name,
-                        'country': country,
-                        'match_found': True,
-                        'sanctions_name': match['sanctions_name'],
-                        'reference_number': match['reference_number'],
-                        'list_type': match['list_type'],
-                        'source': match['source'],
-                        'match_score': match['score']
-                    })        
-            else:
-                # no match found
-                results.append({
-                    'company_id': company_id,
-                    'company_name': company_name,
-                    'country': country,
-                    'match_found': False,
-                    'sanctions_name': None,
-                    'reference_number': None,
-                    'list_type': None,
-                    'source': None,
-                    'match_score': None
-                })
-            
-        results_df = pd.DataFrame(results)
-        
         matches_count = results_df['match_found'].sum()
-        logger.info(f'Matching complete. Found {matches_count} potential matches out of {len(companies_df)} companies')
-        
+        logger.info('Matching complete. Found %d potential matches out of %d companies', matches_count, len(companies_df))
+
         return results_df
\ No newline at end of file